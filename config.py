@@ -10,8 +10,9 @@ OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 JSON_DIR   = os.path.join(BASE_DIR, "json")
 PHOTO_DIR  = os.path.join(BASE_DIR, "photo")
 LOGS_DIR   = os.path.join(BASE_DIR, "logs")
+CACHE_DIR  = os.path.join(BASE_DIR, "cache")
 
-for _d in (OUTPUT_DIR, JSON_DIR, PHOTO_DIR, LOGS_DIR):
+for _d in (OUTPUT_DIR, JSON_DIR, PHOTO_DIR, LOGS_DIR, CACHE_DIR):
     os.makedirs(_d, exist_ok=True)
 
 # ── 网络请求 ──────────────────────────────────────────────────
@@ -28,14 +29,22 @@ BETWEEN_BATCHES_DELAY     = 1.0
 
 # ── 评论延迟（秒） ────────────────────────────────────────────
 COMMENT_REQUEST_DELAY    = 0.05
-L2_COMMENT_REQUEST_DELAY = 1.0
+L2_COMMENT_RPS           = 4.0   # L2 回复全局请求速率（次/秒，所有线程共享）
 COMMENT_MAX_WORKERS      = 5
 
 # ── 并发 ──────────────────────────────────────────────────────
 PHOTO_MAX_WORKERS    = 5   # 图片下载线程数（始终生效）
 TEXT_MAX_WORKERS     = 10
+COLLECTION_PAGE_WORKERS = 4   # 合集帖子列表分页并发数
+SUBSCRIPTION_PAGE_WORKERS = 4   # 订阅列表分页并发数
 DEFAULT_POST_WORKERS = 1   # 帖子级并发（1 = 单线程，--threads N 可覆盖）
 
+# ── 缓存 ──────────────────────────────────────────────────────
+COLLECTION_CACHE_TTL = 24 * 3600   # 合集帖子列表缓存有效期（秒）
+
+# ── 输出 ──────────────────────────────────────────────────────
+JSON_PRETTY = False   # 原始 JSON 是否缩进输出（便于人工查看，但体积更大、写入更慢）
+
 # ── 标签默认参数 ──────────────────────────────────────────────
 DEFAULT_LIST_TYPE  = "total"
 DEFAULT_TIME_LIMIT = ""     # 空字符串 = 不限制时间
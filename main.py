@@ -3,7 +3,7 @@ Lofter 下载器 v2 — 入口文件
 用法：
   python main.py tag   <标签名> [<标签名2> ...]  [选项]
   python main.py blog  <帖子URL或ID>             [--blog_id ID] [选项]
-  python main.py comment <帖子ID>               --blog_id ID   [选项]
+  python main.py comment <帖子ID> [<帖子ID2> ...] --blog_id ID [选项]
   python main.py collection <合集ID>             [选项]
   python main.py subscription                    [选项]
 
@@ -24,21 +24,14 @@ import time
 
 import config
 from src.core.api_client import LofterClient
-from src.logger import StatusDisplay
+from src.logger import StatusDisplay, flush_logs
+from src.progress import format_time
 from src.services.blog_service import BlogService
 from src.services.collection_service import CollectionService
 from src.services.subscription_service import SubscriptionService
 from src.services.tag_service import TagService
 
 
-def _format_time(seconds: float) -> str:
-    if seconds < 60:
-        return f"{seconds:.1f}s"
-    if seconds < 3600:
-        return f"{seconds / 60:.1f}m"
-    return f"{seconds / 3600:.1f}h"
-
-
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="main.py",
@@ -72,12 +65,12 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def run(args: argparse.Namespace) -> dict:
-    client = LofterClient(debug=args.debug)
-    mode   = args.mode
-    values = args.value or []
+    workers     = max(1, args.threads)
+    client      = LofterClient(debug=args.debug, post_workers=workers)
+    mode        = args.mode
+    values      = args.value or []
     dl_comments = not args.no_comments
     dl_images   = not args.no_photos
-    workers     = max(1, args.threads)
 
     # ── tag 模式 ─────────────────────────────────────────────
     if mode == "tag":
@@ -113,6 +106,8 @@ def run(args: argparse.Namespace) -> dict:
             download_comments=True,   # blog 模式总是下载评论
             download_images=dl_images,
         )
+        svc.close()
+        client.shutdown_comment_pool()
         return {
             "success":         r.success,
             "base_filename":   r.base_filename,
@@ -125,20 +120,24 @@ def run(args: argparse.Namespace) -> dict:
         if not values or not args.blog_id:
             StatusDisplay.print_error("comment 模式需要提供帖子 ID 和 --blog_id 参数")
             return {"success": False}
-        post_id = values[0].strip("\"'")
-        # comment 模式：下载帖子详情 + 评论，不下载图片
-        svc = BlogService(client, args.debug)
-        r   = svc.download_post_by_id(
-            post_id=post_id,
+        post_ids = [v.strip("\"'") for v in values if v]
+        # comment 模式：下载帖子详情 + 评论，不下载图片；多个帖子按 --threads 并发
+        svc     = BlogService(client, args.debug)
+        results = svc.download_posts_by_id(
+            post_ids=post_ids,
             blog_id=args.blog_id,
             download_comments=True,
             download_images=False,
+            post_workers=workers,
         )
+        svc.close()
+        client.shutdown_comment_pool()
+        failed = [r for r in results if not r.success]
         return {
-            "success":        r.success,
-            "post_id":        r.post_id,
+            "success":        not failed,
+            "post_id":        ", ".join(r.post_id for r in results),
             "comments_count": 0,   # 不再逐行统计
-            "error":          r.error,
+            "error":          "; ".join(f"{r.post_id}: {r.error}" for r in failed),
         }
 
     # ── collection 模式 ──────────────────────────────────────
@@ -164,8 +163,9 @@ def run(args: argparse.Namespace) -> dict:
 
 
 def print_result(mode: str, result: dict, elapsed: float) -> None:
+    flush_logs()
     StatusDisplay.print_header("爬取完成")
-    StatusDisplay.print_info(f"总用时: {_format_time(elapsed)}")
+    StatusDisplay.print_info(f"总用时: {format_time(elapsed)}")
 
     if not result:
         StatusDisplay.print_warning("没有返回结果")
@@ -230,9 +230,11 @@ def main() -> None:
     try:
         result = run(args)
     except KeyboardInterrupt:
+        flush_logs()
         StatusDisplay.print_warning("\n操作被用户中断")
         sys.exit(0)
     except Exception as e:
+        flush_logs()
         StatusDisplay.print_error(f"处理过程中发生未捕获异常: {e}")
         if args.debug:
             import traceback
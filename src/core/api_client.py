@@ -4,8 +4,13 @@ Lofter API 客户端 — 纯网络请求层，不做任何文件 I/O。
 所有与 Lofter 服务器的通信都经由此类。
 """
 import concurrent.futures
-import json
+import functools
+import itertools
+import os
+import random
+import threading
 import time
+from collections import OrderedDict, deque
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
@@ -13,7 +18,9 @@ from urllib.parse import urlparse
 import requests
 
 import config
-from cookie import USER_COOKIE
+from src import fastjson
+from src.logger import get_logger
+from src.rate_limiter import RateLimiter
 
 # ── API 端点 ──────────────────────────────────────────────────
 _BASE           = "https://api.lofter.com"
@@ -25,6 +32,28 @@ COLLECTION_URL  = f"{_BASE}/v1.1/postCollection.api"
 SUBSCRIPTION_URL= f"{_BASE}/newapi/subscribeCollection/list.json"
 BLOGINFO_URL    = f"{_BASE}/v1.1/bloginfo.api"
 
+# L2 回复请求共享的全局限速器（替代每个线程各自 sleep）
+_L2_LIMITER = RateLimiter(config.L2_COMMENT_RPS)
+
+# L2 回复请求中的固定参数
+_L2_BASE_PARAMS = {"offset": 0, "fromSrc": "", "fromId": ""}
+
+# fetch_post_detail_by_id 结果缓存上限（帖子详情可能较大，只保留最近的若干条）
+_DETAIL_CACHE_SIZE = 64
+
+
+def _format_ts(ts_ms: int) -> str:
+    """毫秒时间戳 → 'YYYY-mm-dd HH:MM:SS'。"""
+    if not ts_ms:
+        return ""
+    # 输出只精确到秒，按秒取整后再查缓存，同一秒内的回复共用一次 strftime
+    return _format_ts_sec(int(ts_ms // 1000))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_ts_sec(ts_sec: int) -> str:
+    return datetime.fromtimestamp(ts_sec).strftime("%Y-%m-%d %H:%M:%S")
+
 
 # ── 固定请求头（模拟 Android 客户端，不含 Cookie）──────────────
 # Cookie 在每次请求时动态从 cookie.py 读取，避免模块缓存问题
@@ -46,6 +75,44 @@ _BASE_HEADERS = {
     ),
 }
 
+# fetch_html 使用的浏览器请求头（模拟桌面 Chrome）
+_BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+# cookie.py 上次加载时的修改时间
+_cookie_mtime: Optional[float] = None
+
+
+def _load_user_cookie() -> dict:
+    """
+    返回 cookie.py 中当前的 USER_COOKIE。
+    文件修改时间与上次加载时相同则直接复用已导入的模块，否则重新加载。
+    """
+    global _cookie_mtime
+    import importlib, sys
+    mod = sys.modules.get("cookie")
+    if mod is None:
+        import cookie as mod  # type: ignore
+    else:
+        try:
+            mtime = os.path.getmtime(mod.__file__)
+        except (OSError, TypeError):
+            mtime = None
+        if mtime is None or mtime != _cookie_mtime:
+            mod = importlib.reload(mod)
+    try:
+        _cookie_mtime = os.path.getmtime(mod.__file__)
+    except (OSError, TypeError):
+        _cookie_mtime = None
+    return mod.USER_COOKIE
+
 
 class LofterClient:
     """
@@ -54,17 +121,17 @@ class LofterClient:
     不做任何文件写入或业务逻辑处理。
     """
 
-    def __init__(self, debug: bool = False) -> None:
-        self.debug = debug
-
-        # ── 每次实例化时重新从 cookie.py 读取 Cookie ──────────────
-        # 直接导入当前运行时的 USER_COOKIE（不依赖模块级常量）
-        import importlib, sys
-        if "cookie" in sys.modules:
-            _ck_mod = importlib.reload(sys.modules["cookie"])
-        else:
-            import cookie as _ck_mod  # type: ignore
-        _ck = _ck_mod.USER_COOKIE
+    def __init__(self, debug: bool = False, post_workers: int = 1) -> None:
+        """
+        Args:
+            post_workers: 本次运行的帖子级并发数，用于估算连接池大小
+        """
+        self.debug   = debug
+        # 面向用户的进度信息走统一日志（后台线程输出，参数惰性格式化）
+        self._logger = get_logger("LofterClient", debug)
+
+        # ── 实例化时读取 cookie.py 的最新内容（文件未改动则不重复加载）──
+        _ck = _load_user_cookie()
         _raw = f"{_ck['name']}={_ck['value']}"
         try:
             _raw.encode("latin-1")
@@ -72,27 +139,60 @@ class LofterClient:
         except UnicodeEncodeError:
             _cookie_str = _raw.encode("ascii", errors="ignore").decode("ascii")
             if not _cookie_str.strip():
-                print(
-                    "\033[31m[ERR]\033[0m  cookie.py 的 value 包含非 ASCII 字符，"
+                self._logger.error(
+                    "cookie.py 的 value 包含非 ASCII 字符，"
                     "请替换为真实的 Lofter Authorization token。"
                 )
 
         self._headers = _BASE_HEADERS.copy()
         self._headers["Cookie"] = _cookie_str
+        # fetch_html 使用的浏览器 Cookie，同样取自刚重新加载的 cookie.py
+        self._html_cookies = {_ck["name"]: _ck["value"]}
 
-        if debug:
-            print(f"\033[37m[DEBUG][LofterClient]\033[0m Cookie: "
-                  f"{_cookie_str[:30]}…（共 {len(_cookie_str)} 字节）")
+        self._log("Cookie: %s…（共 %d 字节）", _cookie_str[:30], len(_cookie_str))
 
         self.session = requests.Session()
         self.session.headers.update(self._headers)
+        # 连接池按并发线程数放大：评论 / 图片 / 文本线程同时复用 keep-alive 连接，
+        # 默认的 10 个连接不够时会丢弃连接并重新握手。
+        # 评论线程池全局共用一个；图片线程池每个并发帖子各有一个，需按帖子并发数放大
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=(config.COMMENT_MAX_WORKERS
+                          + config.PHOTO_MAX_WORKERS * max(1, post_workers)
+                          + config.TEXT_MAX_WORKERS),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # 按 (post_id, blog_id) 缓存帖子详情，重复请求同一帖子时不再联网
+        self._detail_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._detail_cache_lock = threading.Lock()
+
+        # 评论 L2 抓取线程池：所有帖子共用一个，按需创建
+        self._comment_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._comment_pool_lock = threading.Lock()
+
+    def shutdown_comment_pool(self) -> None:
+        """关闭共享的评论线程池（下次抓取评论时会重新创建）。"""
+        with self._comment_pool_lock:
+            pool, self._comment_pool = self._comment_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _get_comment_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._comment_pool_lock:
+            if self._comment_pool is None:
+                self._comment_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=config.COMMENT_MAX_WORKERS,
+                    thread_name_prefix="comment",
+                )
+            return self._comment_pool
 
     # ── 内部工具 ────────────────────────────────────────────────
 
-    def _log(self, msg: str) -> None:
-        if self.debug:
-            safe = str(msg).encode("utf-8", "replace").decode("utf-8")
-            print(f"\033[37m[DEBUG][LofterClient]\033[0m {safe}")
+    def _log(self, msg: str, *args) -> None:
+        """调试输出；与其他日志同走队列，参数按 % 惰性格式化，非 debug 模式下不做字符串拼接。"""
+        self._logger.debug(msg, *args)
 
     def _request(self, method: str, url: str, *,
                  params: dict = None, data=None,
@@ -100,14 +200,14 @@ class LofterClient:
                  max_retries: int = None) -> Optional[dict]:
         """通用请求方法，含重试逻辑。返回解析后的 JSON dict 或 None。"""
         retries = max_retries if max_retries is not None else config.MAX_RETRIES
-        hdrs    = self._headers.copy()   # 使用实例级 headers（含最新 Cookie）
-        if headers:
-            hdrs.update(headers)
+        # 实例级 headers（含最新 Cookie）已设在 session 上，由 requests 自动合并；
+        # 这里只传入本次额外的 headers，不再每次复制整张表
+        hdrs    = headers
 
         # Debug: 打印实际发出的请求头（Cookie 脱敏显示最后8位）
         if self.debug:
             safe_hdrs = {}
-            for k, v in hdrs.items():
+            for k, v in {**self._headers, **(headers or {})}.items():
                 if k.lower() == "cookie":
                     safe_hdrs[k] = v[:20] + "…" + v[-8:] if len(v) > 28 else v
                 else:
@@ -129,10 +229,10 @@ class LofterClient:
                                              timeout=config.REQUEST_TIMEOUT)
 
                 resp.raise_for_status()
-                result = resp.json()
+                result = fastjson.loads(resp.content)
 
                 if isinstance(result, dict) and result.get("code") == 500:
-                    self._log(f"API error (attempt {attempt+1}/{retries}): {result.get('msg')}")
+                    self._log("API error (attempt %d/%d): %s", attempt + 1, retries, result.get("msg"))
                     if attempt < retries - 1:
                         time.sleep(3 + 2 ** attempt)
                         continue
@@ -140,8 +240,8 @@ class LofterClient:
 
                 return result
 
-            except (requests.RequestException, json.JSONDecodeError) as e:
-                self._log(f"Request failed (attempt {attempt+1}/{retries}): {e}")
+            except (requests.RequestException, fastjson.JSONDecodeError) as e:
+                self._log("Request failed (attempt %d/%d): %s", attempt + 1, retries, e)
                 if attempt < retries - 1:
                     time.sleep(3 + 2 ** attempt)
 
@@ -166,17 +266,24 @@ class LofterClient:
         permalinks:  set        = set()
         offset:      int        = 0
 
-        print(f"\033[32m[INFO]\033[0m 开始获取标签 '{tag}' 的帖子…")
+        self._logger.info("开始获取标签 '%s' 的帖子…", tag)
 
+        # 翻页时只有 offset 变化，其余字段构造一次
+        data = {
+            "postTypes": blog_type,
+            "offset":    "0",
+            "postYm":    timelimit,
+            "tag":       tag,
+            "type":      list_type,
+            "limit":     10,
+        }
+        # 下一页的 offset 由本页响应给出，无法提前并发请求；
+        # 页间间隔改由限速器计时，请求本身耗时计入间隔，不再额外叠加 sleep
+        delay   = config.BETWEEN_PAGES_DELAY
+        limiter = RateLimiter(1 / delay if delay > 0 else 0)
         while True:
-            data = {
-                "postTypes": blog_type,
-                "offset":    str(offset),
-                "postYm":    timelimit,
-                "tag":       tag,
-                "type":      list_type,
-                "limit":     10,
-            }
+            limiter.acquire()
+            data["offset"] = str(offset)
             resp = self._request("POST", TAG_POSTS_URL, data=data)
             if resp:
                 all_pages.append(resp)
@@ -199,10 +306,9 @@ class LofterClient:
                 permalinks.add(p["postData"]["postView"]["permalink"])
 
             offset = resp["data"]["offset"]
-            print(f"\033[32m[INFO]\033[0m 标签 '{tag}': 已获取 {len(all_posts)} 篇")
-            time.sleep(config.BETWEEN_PAGES_DELAY)
+            self._logger.info("标签 '%s': 已获取 %d 篇", tag, len(all_posts))
 
-        print(f"\033[32m[INFO]\033[0m 标签 '{tag}' 获取完成，共 {len(all_posts)} 篇")
+        self._logger.info("标签 '%s' 获取完成，共 %d 篇", tag, len(all_posts))
         # 把原始分页数据也挂在返回值上，供 TagService 存档
         self._last_tag_pages = all_pages
         return all_posts
@@ -222,7 +328,26 @@ class LofterClient:
         return self._request("POST", POST_DETAIL_URL, data=data)
 
     def fetch_post_detail_by_id(self, post_id: str, blog_id: str) -> Optional[dict]:
-        """通过 post_id + blog_id 直接获取帖子详情（自动解析博客域名）。"""
+        """
+        通过 post_id + blog_id 直接获取帖子详情（自动解析博客域名）。
+        成功的结果按 (post_id, blog_id) 缓存最近 _DETAIL_CACHE_SIZE 条。
+        """
+        key = (str(post_id), str(blog_id))
+        with self._detail_cache_lock:
+            cached = self._detail_cache.get(key)
+            if cached is not None:
+                self._detail_cache.move_to_end(key)
+                return cached
+
+        detail = self._fetch_post_detail_by_id(post_id, blog_id)
+        if detail and detail.get("response"):
+            with self._detail_cache_lock:
+                self._detail_cache[key] = detail
+                if len(self._detail_cache) > _DETAIL_CACHE_SIZE:
+                    self._detail_cache.popitem(last=False)
+        return detail
+
+    def _fetch_post_detail_by_id(self, post_id: str, blog_id: str) -> Optional[dict]:
         # 先尝试获取博客域名
         blog_resp = self._request("GET", BLOGINFO_URL,
                                   params={"product": "lofter-android-7.9.7.2",
@@ -256,37 +381,47 @@ class LofterClient:
         获取帖子的全部评论（L1 + L2 回复）。
         返回 {"hot_list": [...], "all_list": [...]}，每条评论已归一化。
         """
+        # L1 列表与已成功获取的 L2 回复（comment_id → raw 列表）跨重试保留，
+        # 重试时只补做失败的部分，不再从头请求
+        l1: Optional[tuple] = None
+        l2_cache: Dict[str, List[dict]] = {}
         for attempt in range(max_retries):
             try:
-                return self._fetch_all_comments_once(post_id, blog_id)
+                if l1 is None:
+                    l1 = self._fetch_l1_comments(post_id, blog_id)
+                return self._attach_all_l2(post_id, blog_id, *l1, l2_cache)
             except Exception as e:
-                self._log(f"评论获取失败 (attempt {attempt+1}/{max_retries}): {e}")
+                self._log("评论获取失败 (attempt %d/%d): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
-                    time.sleep((attempt + 1) * 2)
+                    time.sleep(min(30, 2 ** (attempt + 1) + random.random()))
         return {"hot_list": [], "all_list": []}
 
-    def _fetch_all_comments_once(self, post_id: str, blog_id: str) -> dict:
+    def _fetch_l1_comments(self, post_id: str, blog_id: str) -> tuple:
+        """翻页获取全部 L1 评论，返回 (热门评论, 普通评论)，均为原始结构。"""
         offset          = 0
         hot_comments:   List[dict] = []
         all_comments:   List[dict] = []
         seen_ids:       set        = set()
         page            = 1
 
+        # 翻页时只有 offset 变化，其余参数构造一次
+        params = {
+            "postId":          post_id,
+            "blogId":          blog_id,
+            "offset":          0,
+            "product":         "lofter-android-8.2.18",
+            "needGift":        0,
+            "openFansVipPlan": 0,
+            "dunType":         1,
+        }
         while True:
-            params = {
-                "postId":          post_id,
-                "blogId":          blog_id,
-                "offset":          offset,
-                "product":         "lofter-android-8.2.18",
-                "needGift":        0,
-                "openFansVipPlan": 0,
-                "dunType":         1,
-            }
+            params["offset"] = offset
             resp = self._request("GET", L1_COMMENTS_URL, params=params)
 
             if not resp or resp.get("code") != 0 or "data" not in resp:
                 break
 
+            seen_before = len(seen_ids)
             for c in resp["data"].get("hotList", []):
                 cid = c.get("id")
                 if cid and cid not in seen_ids:
@@ -302,41 +437,81 @@ class LofterClient:
                     seen_ids.add(cid)
 
             next_offset = resp["data"].get("offset", -1)
-            if next_offset == -1:
+            # 本页没有新评论，或服务端返回了同一偏移量 → 继续翻页已无意义
+            if next_offset == -1 or next_offset == offset or len(seen_ids) == seen_before:
                 break
             offset = next_offset
             page  += 1
             time.sleep(config.COMMENT_REQUEST_DELAY)
 
-        combined = hot_comments + all_comments
-
-        # 并发获取 L2 回复
-        def _with_replies(c: dict) -> dict:
-            return self._attach_l2_replies(post_id, blog_id, c)
+        return hot_comments, all_comments
 
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=config.COMMENT_MAX_WORKERS
-        ) as ex:
-            hot_done = list(ex.map(_with_replies, hot_comments))
-            all_done = list(ex.map(_with_replies, combined))
+    def _attach_all_l2(self, post_id: str, blog_id: str,
+                       hot_comments: List[dict], all_comments: List[dict],
+                       l2_cache: Dict[str, List[dict]]) -> dict:
+        """为全部 L1 评论附加 L2 回复并归一化。"""
+        combined = hot_comments + all_comments
+        # 同一帖子内按 blogId 复用作者信息字典（dict 读写在 GIL 下是原子的）
+        author_cache: Dict[str, dict] = {}
+
+        # 并发获取 L2 回复；热门评论位于 combined 头部，只需处理一次。
+        # 内嵌回复已完整的评论不需要联网，直接在当前线程归一化。
+        all_done: List[Optional[dict]] = [None] * len(combined)
+        need_fetch: List[int] = []
+        for i, c in enumerate(combined):
+            if c.get("l2Count", 0) > len(c.get("l2Comments", [])):
+                need_fetch.append(i)
+            else:
+                all_done[i] = self._attach_l2_replies(post_id, blog_id, c,
+                                                      author_cache, l2_cache)
+
+        if need_fetch:
+            # 滑动窗口提交：同时在途的任务不超过 2×线程数，
+            # 评论很多时不会一次性创建全部 Future
+            pool    = self._get_comment_pool()
+            window  = 2 * config.COMMENT_MAX_WORKERS
+            pending: Dict[concurrent.futures.Future, int] = {}
+            todo    = iter(need_fetch)
+            while True:
+                for i in todo:
+                    fut = pool.submit(self._attach_l2_replies, post_id, blog_id,
+                                      combined[i], author_cache, l2_cache)
+                    pending[fut] = i
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for fut in done:
+                    all_done[pending.pop(fut)] = fut.result()
 
-        return {"hot_list": hot_done, "all_list": all_done}
+        return {"hot_list": all_done[:len(hot_comments)], "all_list": all_done}
 
     def _attach_l2_replies(self, post_id: str, blog_id: str,
-                           l1_comment: dict) -> dict:
+                           l1_comment: dict,
+                           author_cache: Optional[Dict[str, dict]] = None,
+                           l2_cache: Optional[Dict[str, List[dict]]] = None) -> dict:
         """给 L1 评论附加归一化后的 L2 回复列表，并返回归一化的 L1 评论。"""
         comment_id    = l1_comment["id"]
         embedded_l2   = l1_comment.get("l2Comments", [])
         l2_count      = l1_comment.get("l2Count", 0)
-        normalized    = self._normalize_comment(l1_comment)
-        replies       = [self._normalize_comment(r) for r in embedded_l2]
+        normalized    = self._normalize_comment(l1_comment, author_cache)
+        replies: List[dict] = [self._normalize_comment(r, author_cache)
+                               for r in embedded_l2]
 
         if l2_count > len(embedded_l2):
-            extra = self._fetch_l2(post_id, blog_id, comment_id)
-            embedded_ids = {r.get("id") for r in embedded_l2}
+            # 只有需要补抓时才建 id 集合；直接取已归一化回复的 id，不再扫描原始列表
+            embedded_ids = {r["id"] for r in replies}
+            extra = l2_cache.get(comment_id) if l2_cache is not None else None
+            if extra is None:
+                extra = self._fetch_l2(post_id, blog_id, comment_id)
+                if extra and l2_cache is not None:
+                    l2_cache[comment_id] = extra
             for r in extra:
-                if r.get("id") not in embedded_ids:
-                    replies.append(self._normalize_comment(r))
+                if r.get("id", "") not in embedded_ids:
+                    replies.append(self._normalize_comment(r, author_cache))
 
         normalized["replies"]  = replies
         normalized["l2_count"] = len(replies)
@@ -345,14 +520,12 @@ class LofterClient:
     def _fetch_l2(self, post_id: str, blog_id: str,
                   comment_id: str) -> List[dict]:
         """获取单条 L1 评论的 L2 回复列表（raw）。"""
-        time.sleep(config.L2_COMMENT_REQUEST_DELAY)
+        _L2_LIMITER.acquire()
         params = {
+            **_L2_BASE_PARAMS,
             "postId":  post_id,
             "blogId":  blog_id,
             "id":      comment_id,
-            "offset":  0,
-            "fromSrc": "",
-            "fromId":  "",
         }
         resp = self._request("GET", L2_COMMENTS_URL, params=params)
         if not resp or resp.get("code") != 0:
@@ -363,28 +536,38 @@ class LofterClient:
                 (data if isinstance(data, list) else []))
 
     @staticmethod
-    def _normalize_comment(raw: dict) -> dict:
-        """将原始评论字典转换为统一格式（与原版完全一致）。"""
-        pub_info = raw.get("publisherBlogInfo", {})
-        pub_ts   = raw.get("publishTime", 0)
-        pub_str  = (datetime.fromtimestamp(pub_ts / 1000).strftime("%Y-%m-%d %H:%M:%S")
-                    if pub_ts else "")
+    def _normalize_comment(raw: dict,
+                           author_cache: Optional[Dict[str, dict]] = None) -> dict:
+        """
+        将原始评论字典转换为统一格式（与原版完全一致）。
+        传入 author_cache 时，同一 blogId 的作者信息只构造一次。
+        """
+        g        = raw.get
+        pub      = g("publisherBlogInfo") or {}
+        pub_ts   = g("publishTime", 0)
+        content  = g("content") or ""
+        bid      = pub.get("blogId", "")
+        author   = author_cache.get(bid) if author_cache is not None and bid else None
+        if author is None:
+            author = {
+                "blogNickName": pub.get("blogNickName", ""),
+                "blogId":       bid,
+                "blogName":     pub.get("blogName", ""),
+                "avatar":       pub.get("smallLogo", ""),
+            }
+            if author_cache is not None and bid:
+                author_cache[bid] = author
         return {
-            "id":                   raw.get("id", ""),
-            "content":              raw.get("content", "").strip(),
+            "id":                   g("id", ""),
+            "content":              content.strip() if content else "",
             "publishTime":          pub_ts,
-            "publishTimeFormatted": pub_str,
-            "likeCount":            raw.get("likeCount", 0),
-            "ipLocation":           raw.get("ipLocation", ""),
-            "quote":                raw.get("quote", ""),
-            "author": {
-                "blogNickName": pub_info.get("blogNickName", ""),
-                "blogId":       pub_info.get("blogId", ""),
-                "blogName":     pub_info.get("blogName", ""),
-                "avatar":       pub_info.get("smallLogo", ""),
-            },
-            "emotes":   raw.get("emotes", []),
-            "replyTo":  raw.get("replyTo", {}),
+            "publishTimeFormatted": _format_ts(pub_ts),
+            "likeCount":            g("likeCount", 0),
+            "ipLocation":           g("ipLocation", ""),
+            "quote":                g("quote", ""),
+            "author":   author,
+            "emotes":   g("emotes", []),
+            "replyTo":  g("replyTo", {}),
             "replies":  [],
             "l2_count": 0,
         }
@@ -399,21 +582,20 @@ class LofterClient:
             f"&offset={offset}&limit={limit}"
             f"&collectionid={collection_id}&order=1"
         )
-        hdrs = self._headers.copy()
+        # 实例级 headers 已设在 session 上，这里无需再传
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 COLLECTION_URL,
                 params={"product": "lofter-android-7.6.12"},
                 data=payload,
-                headers=hdrs,
                 timeout=15,
             )
             resp.raise_for_status()
-            body = resp.content.decode("utf-8", errors="replace")
-            data = json.loads(body)
+            # 偶发的非法 UTF-8 字节由 fastjson.loads 按替换字符解码后再解析
+            data = fastjson.loads(resp.content)
             return data.get("response") if data else None
         except Exception as e:
-            self._log(f"get_collection_list error: {e}")
+            self._log("get_collection_list error: %s", e)
             return None
 
     # ── 订阅 API ────────────────────────────────────────────────
@@ -421,11 +603,9 @@ class LofterClient:
     def fetch_subscription_collections(self,
                                         limit_once: int = 50) -> List[dict]:
         """获取当前账号订阅的所有合集列表（自动翻页）。"""
-        all_colls: List[dict] = []
-
         resp = self._request("GET", SUBSCRIPTION_URL,
                              params={"offset": 0, "limit": limit_once})
-        self._log(f"subscription 首页响应: {str(resp)[:500]}")
+        self._log("subscription 首页响应: %.500s", resp)
 
         if not resp:
             self._log("subscription: _request 返回 None（网络错误或重试耗尽）")
@@ -442,38 +622,73 @@ class LofterClient:
 
         data  = resp["data"]
         total = data.get("subscribeCollectionCount", 0)
-        self._log(f"subscription: 订阅总数={total}")
-        all_colls.extend(data.get("collections", []))
+        self._log("subscription: 订阅总数=%s", total)
+        first = data.get("collections", [])
+        if not first:
+            return []
 
-        while len(all_colls) < total:
+        # 总数已知，其余各页偏移量可预先算出，并发请求后按偏移顺序拼接
+        def _fetch_page(offset: int) -> Optional[List[dict]]:
             resp = self._request("GET", SUBSCRIPTION_URL,
-                                 params={"offset": len(all_colls),
-                                         "limit": limit_once})
+                                 params={"offset": offset, "limit": limit_once})
             if not resp or resp.get("code") != 0:
-                break
-            colls = resp.get("data", {}).get("collections", [])
+                return None
+            return resp.get("data", {}).get("collections", [])
+
+        # 服务端实际每页条数可能少于 limit_once，按首页真实条数作为步长
+        step    = len(first)
+        fetched = step
+        failed  = False
+        # 各页先按顺序收集，最后一次性拼接，避免逐页扩容
+        pages: List[List[dict]] = [first]
+        # 同时在途的页数不超过线程数，出错时最多浪费一个窗口内的请求
+        offsets = iter(range(step, total, step))
+        window  = config.SUBSCRIPTION_PAGE_WORKERS
+        with concurrent.futures.ThreadPoolExecutor(max_workers=window) as ex:
+            pending = deque(ex.submit(_fetch_page, off)
+                            for off in itertools.islice(offsets, window))
+            while pending:
+                colls = pending.popleft().result()
+                # 与顺序翻页一致：遇到失败或空页即停止拼接
+                if not colls:
+                    failed = True
+                    break
+                pages.append(colls)
+                fetched += len(colls)
+                if len(colls) < step:
+                    # 页大小不一致，后续预算的偏移已不可靠，改为顺序补齐
+                    break
+                for off in itertools.islice(offsets, 1):
+                    pending.append(ex.submit(_fetch_page, off))
+            # 提前结束时取消尚未开始的请求
+            for fut in pending:
+                fut.cancel()
+
+        while not failed and fetched < total:
+            colls = _fetch_page(fetched)
             if not colls:
                 break
-            all_colls.extend(colls)
+            pages.append(colls)
+            fetched += len(colls)
 
-        return all_colls
+        return list(itertools.chain.from_iterable(pages))
 
     # ── 图片下载 ────────────────────────────────────────────────
 
     def download_photo(self, url: str, filepath: str) -> Optional[str]:
         """下载单张图片到指定路径。成功返回路径，失败返回 None。"""
         try:
-            parsed = urlparse(url)
-            hdrs   = self._headers.copy()
-            hdrs["host"] = parsed.netloc
-            resp = requests.get(url, headers=hdrs, stream=True, timeout=20)
-            if resp.status_code == 200:
-                with open(filepath, "wb") as f:
-                    for chunk in resp.iter_content(8192):
-                        f.write(chunk)
-                return filepath
+            # session 已带实例级 headers，只需按图片域名覆盖 host
+            hdrs = {"host": urlparse(url).netloc}
+            # 复用 session 的连接池；流式响应需关闭后连接才会归还
+            with self.session.get(url, headers=hdrs, stream=True, timeout=20) as resp:
+                if resp.status_code == 200:
+                    with open(filepath, "wb") as f:
+                        for chunk in resp.iter_content(8192):
+                            f.write(chunk)
+                    return filepath
         except Exception as e:
-            self._log(f"download_photo error {url}: {e}")
+            self._log("download_photo error %s: %s", url, e)
         return None
 
     # ── HTML 内容获取（用于从 URL 提取 post/blog id）──────────────
@@ -481,20 +696,10 @@ class LofterClient:
     def fetch_html(self, url: str, timeout: int = 30) -> Optional[str]:
         """通过浏览器 User-Agent 获取页面 HTML，用于从 URL 中提取 ID。"""
         try:
-            browser_hdrs = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            }
-            cookies = {USER_COOKIE["name"]: USER_COOKIE["value"]}
-            resp = requests.get(url, headers=browser_hdrs,
-                                cookies=cookies, timeout=timeout)
+            resp = requests.get(url, headers=_BROWSER_HEADERS,
+                                cookies=self._html_cookies, timeout=timeout)
             if resp.status_code == 200:
                 return resp.text
         except Exception as e:
-            self._log(f"fetch_html error {url}: {e}")
+            self._log("fetch_html error %s: %s", url, e)
         return None
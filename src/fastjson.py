@@ -0,0 +1,98 @@
+"""
+src/fastjson.py
+JSON 编解码适配层 — 依次尝试 orjson、ujson，都未安装时回退到标准库 json。
+"""
+import json
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:
+    _ujson = None
+
+# 所有后端的解析错误都统一为 json.JSONDecodeError
+# （orjson 的异常本身是其子类；ujson 的异常与非法 UTF-8 引起的 UnicodeDecodeError 在 loads 中转换）
+JSONDecodeError = json.JSONDecodeError
+
+# 标准库后端分块写出时，每次积累的字符数
+_CHUNK_CHARS = 64 * 1024
+
+
+def loads(data):
+    """
+    解析 bytes / str 形式的 JSON。
+    bytes 中含有非法 UTF-8 字节时，与 requests 的 resp.json() 一样
+    按替换字符解码后再解析；其余解析错误统一抛出 JSONDecodeError。
+    """
+    try:
+        return _loads(data)
+    except (JSONDecodeError, UnicodeDecodeError) as e:
+        if isinstance(data, (bytes, bytearray)):
+            try:
+                data.decode("utf-8")
+            except UnicodeDecodeError:
+                return _loads(data.decode("utf-8", "replace"))
+        if isinstance(e, JSONDecodeError):
+            raise
+        raise JSONDecodeError(str(e), data.decode("utf-8", "replace"), 0) from e
+
+
+def _loads(data):
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if _ujson is not None:
+        try:
+            return _ujson.loads(data)
+        except ValueError as e:
+            doc = data.decode("utf-8", "replace") if isinstance(data, (bytes, bytearray)) else data
+            raise JSONDecodeError(str(e), doc, 0) from e
+    return json.loads(data)
+
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """
+    序列化为 UTF-8 编码的 JSON bytes（中文不转义）。
+    pretty=True 时缩进 2 空格，否则紧凑输出。
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, option=option)
+    if _ujson is not None:
+        return _ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                            indent=2 if pretty else 0).encode("utf-8")
+    return _encoder(pretty).encode(obj).encode("utf-8")
+
+
+def dump(obj, fp, pretty: bool = False) -> None:
+    """
+    序列化并写入以二进制模式打开的文件对象 fp。
+    标准库后端用 iterencode 分块写出，不在内存中保留整段 JSON 文本。
+    """
+    if _orjson is not None or _ujson is not None:
+        fp.write(dumps(obj, pretty))
+        return
+
+    buf: list = []
+    size      = 0
+    for chunk in _encoder(pretty).iterencode(obj):
+        buf.append(chunk)
+        size += len(chunk)
+        if size >= _CHUNK_CHARS:
+            fp.write("".join(buf).encode("utf-8"))
+            buf.clear()
+            size = 0
+    if buf:
+        fp.write("".join(buf).encode("utf-8"))
+
+
+def _encoder(pretty: bool) -> json.JSONEncoder:
+    if pretty:
+        return json.JSONEncoder(ensure_ascii=False, indent=2)
+    # 紧凑模式去掉默认分隔符中的空格，与 orjson 输出一致
+    return json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
@@ -10,15 +10,18 @@ from typing import Any, Dict, List, Optional
 
 # ── HTML → 纯文本 ──────────────────────────────────────────────
 
-def html_to_text(html_content: str) -> str:
-    """将 HTML 转为纯文本，保留换行结构。"""
-    if not html_content:
-        return ""
-    text = html.unescape(html_content)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</p>", "\n\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
-    return text.strip()
+_LINK_RE = re.compile(
+    r'<a\s+href\s*=\s*["\']([^"\']*)["\'][^>]*>(.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+_IMG_RE   = re.compile(r'<img\s+[^>]*src\s*=\s*["\']([^"\']*)["\'][^>]*>', re.IGNORECASE)
+# <br> 与 </p> 合并为一次扫描；两者前缀不同，不会互相重叠
+_BREAK_RE = re.compile(r"<(?:(br)\s*/?|/p)>", re.IGNORECASE)
+_TAG_RE   = re.compile(r"<[^>]+>")
+
+
+def _replace_break(m: re.Match) -> str:
+    return "\n" if m.group(1) else "\n\n"
 
 
 def extract_links_and_titles(html_content: str) -> str:
@@ -29,37 +32,33 @@ def extract_links_and_titles(html_content: str) -> str:
     if not html_content:
         return ""
     text = html.unescape(html_content)
+    if "<" not in text:
+        # 纯文本（无任何标签）：后续所有正则都不会命中，直接返回
+        return text.strip()
 
     def _replace_link(m: re.Match) -> str:
         href, inner = m.groups()
-        clean = re.sub(r"<[^>]+>", "", inner).strip()
+        clean = _TAG_RE.sub("", inner).strip()
         return f"{clean} (链接: {href})" if clean else href
 
     def _replace_img(m: re.Match) -> str:
         return f"\n[图片] {m.group(1)}\n"
 
-    text = re.sub(
-        r'<a\s+href\s*=\s*["\']([^"\']*)["\'][^>]*>(.*?)</a>',
-        _replace_link, text, flags=re.IGNORECASE | re.DOTALL
-    )
-    text = re.sub(
-        r'<img\s+[^>]*src\s*=\s*["\']([^"\']*)["\'][^>]*>',
-        _replace_img, text, flags=re.IGNORECASE
-    )
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</p>", "\n\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _LINK_RE.sub(_replace_link, text)
+    text = _IMG_RE.sub(_replace_img, text)
+    text = _BREAK_RE.sub(_replace_break, text)
+    text = _TAG_RE.sub("", text)
     return text.strip()
 
 
 # ── 文件名工具 ─────────────────────────────────────────────────
 
-_UNSAFE = re.compile(r'[\\/*?:"<>|]')
+_UNSAFE_TABLE = str.maketrans({c: "_" for c in '\\/*?:"<>|'})
 
 
-def make_safe_filename(s: str, max_len: int = 100) -> str:
-    """将字符串中不合法的文件名字符替换为下划线。"""
-    return _UNSAFE.sub("_", s)[:max_len]
+def make_safe_filename(s: str, max_len: Optional[int] = 100) -> str:
+    """将字符串中不合法的文件名字符替换为下划线；max_len=None 表示不截断。"""
+    return s.translate(_UNSAFE_TABLE)[:max_len]
 
 
 def build_post_filename(title: str, author: str,
@@ -83,30 +82,41 @@ def build_post_filename(title: str, author: str,
 
 def extract_post_metadata(post_detail_json: Dict[str, Any]) -> Dict[str, str]:
     """从 API 返回的帖子详情 JSON 中提取人类可读的元数据。"""
-    try:
-        record   = post_detail_json["response"]["posts"][0]
-        post     = record["post"]
-        blog_info = post.get("blogInfo", {})
-
-        publish_ts = post.get("publishTime", 0)
-        publish_str = (
-            datetime.fromtimestamp(publish_ts / 1000).strftime("%Y-%m-%d %H:%M:%S")
-            if publish_ts else ""
-        )
-        return {
-            "title":        post.get("title", "Untitled"),
-            "publish_time": publish_str,
-            "author":       blog_info.get("blogNickName", "Unknown Author"),
-            "blog_name":    blog_info.get("blogName", ""),
-            "blog_id":      str(blog_info.get("blogId", "")),
-            "blog_url":     post.get("blogPageUrl", ""),
-            "tags":         ", ".join(post.get("tagList", [])),
-        }
-    except (KeyError, IndexError):
+    post = _unwrap_post(post_detail_json)
+    if post is None:
         return {
             "title": "Untitled", "publish_time": "", "author": "Unknown",
             "blog_name": "", "blog_id": "", "blog_url": "", "tags": "",
         }
+    return _post_metadata(post)
+
+
+def _unwrap_post(post_detail_json: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """取出 response.posts[0].post；结构不完整时返回 None。"""
+    try:
+        return post_detail_json["response"]["posts"][0]["post"]
+    except (KeyError, IndexError):
+        return None
+
+
+def _post_metadata(post: Dict[str, Any]) -> Dict[str, str]:
+    """extract_post_metadata 的核心部分，直接作用于已解包的 post 字典。"""
+    blog_info = post.get("blogInfo", {})
+
+    publish_ts = post.get("publishTime", 0)
+    publish_str = (
+        datetime.fromtimestamp(publish_ts / 1000).strftime("%Y-%m-%d %H:%M:%S")
+        if publish_ts else ""
+    )
+    return {
+        "title":        post.get("title", "Untitled"),
+        "publish_time": publish_str,
+        "author":       blog_info.get("blogNickName", "Unknown Author"),
+        "blog_name":    blog_info.get("blogName", ""),
+        "blog_id":      str(blog_info.get("blogId", "")),
+        "blog_url":     post.get("blogPageUrl", ""),
+        "tags":         ", ".join(post.get("tagList", [])),
+    }
 
 
 # ── 帖子文本格式化 ─────────────────────────────────────────────
@@ -122,8 +132,26 @@ def format_post_as_text(post_detail_json: Dict[str, Any],
                        ""   = 下载了但无评论（输出"暂无评论"）；
                        str  = 正常评论文本。
     """
-    meta    = extract_post_metadata(post_detail_json)
-    content = _extract_post_body(post_detail_json)
+    return "\n".join(post_text_lines(post_detail_json, photo_links, comments_text))
+
+
+def post_text_lines(post_detail_json: Dict[str, Any],
+                    photo_links: Optional[List[str]] = None,
+                    comments_text: Optional[str] = None,
+                    meta: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    format_post_as_text 的逐行版本：返回行列表（不含换行符），
+    可直接交给 FileWriter.write_lines 流式写入，不拼接整篇文本。
+
+    Args:
+        meta: 调用方已通过 extract_post_metadata 取得的元数据，传入可免去重复提取。
+    """
+    post    = _unwrap_post(post_detail_json)
+    if meta is None:
+        # 已解包的 post 直接取元数据，不再二次走 response.posts[0].post
+        meta = (_post_metadata(post) if post is not None
+                else extract_post_metadata(post_detail_json))
+    content = _extract_post_body(post) if post is not None else ""
 
     lines: List[str] = [
         f"标题: {meta['title']}",
@@ -146,14 +174,12 @@ def format_post_as_text(post_detail_json: Dict[str, Any],
         lines += ["\n\n\n\n", "【评论】"]
         lines.append(comments_text if comments_text else "(暂无评论)")
 
-    return "\n".join(lines)
+    return lines
 
 
-def _extract_post_body(post_detail_json: Dict[str, Any]) -> str:
+def _extract_post_body(post: Dict[str, Any]) -> str:
     """提取帖子正文（含彩蛋内容），经过 HTML 清理。"""
     try:
-        post = post_detail_json["response"]["posts"][0]["post"]
-
         # 尝试拼接彩蛋内容
         raw_content = post.get("content", "")
         return_content_list = post.get("returnContent", [])
@@ -173,69 +199,100 @@ def _extract_post_body(post_detail_json: Dict[str, Any]) -> str:
 
 # ── 评论文本格式化 ─────────────────────────────────────────────
 
+# 缺省值共享同一个只读对象，避免每次 .get 未命中都新建空容器
+_EMPTY: Dict[str, Any] = {}
+_NO_ITEMS: tuple       = ()
+
+# 每条主评论前的分隔线
+_SEP_HEAVY = "——————————————————————————\n"
+
+
 def format_comment(comment: Dict[str, Any], is_reply: bool = False,
                    indent: str = "") -> str:
     """格式化单条评论（含回复列表），与原版格式完全一致。"""
-    author    = comment.get("author", {}).get("blogNickName", "Unknown")
-    blog_name = comment.get("author", {}).get("blogName", "")
-    content   = comment.get("content", "").strip()
-    pub_time  = comment.get("publishTimeFormatted", "")
-    likes     = comment.get("likeCount", 0)
-    ip_loc    = comment.get("ipLocation", "")
-    quote     = comment.get("quote", "")
-    replies   = comment.get("replies", [])
-    emotes    = comment.get("emotes", [])
-
-    result = ""
-
-    if not is_reply:
-        result += f"{indent}——————————————————————————\n"
+    parts: List[str] = []
+    _emit_comment(parts, comment, is_reply, indent)
+    return "".join(parts)
 
-    if quote:
-        result += f"{indent}引用：{quote}\n"
 
-    name_str = f"{author}[{blog_name}]" if blog_name else author
+def _emit_comment(parts: List[str], comment: Dict[str, Any],
+                  is_reply: bool = False, indent: str = "") -> None:
+    """
+    format_comment 的片段版本：把单条评论的文本片段直接追加到调用方的 parts，
+    整个评论块共用一个列表，最后只 join 一次。
+    """
+    g         = comment.get
+    content   = (g("content") or "").strip()
+    pub_time  = g("publishTimeFormatted", "")
+    likes     = g("likeCount", 0)
+    ip_loc    = g("ipLocation", "")
+    quote     = g("quote", "")
+    replies   = g("replies") or _NO_ITEMS
+    emotes    = g("emotes") or _NO_ITEMS
+
+    # 评论主体（分隔线 → 引用 → 发布人/时间/内容/点赞 → IP）一次格式化完成
+    name_str = _display_name(g("author"))
     label    = "作者" if is_reply else "发布人"
-    result  += f"{indent}{label}：{name_str}\n"
-    result  += f"{indent}时间：{pub_time}\n"
-    result  += f"{indent}内容：{content}\n"
-    result  += f"{indent}点赞数：{likes}\n"
-
-    if ip_loc:
-        result += f"{indent}IP属地：{ip_loc}\n"
+    hdr      = "" if is_reply else indent + _SEP_HEAVY
+    quote_ln = f"{indent}引用：{quote}\n" if quote else ""
+    ip_ln    = f"{indent}IP属地：{ip_loc}\n" if ip_loc else ""
+
+    add = parts.append
+    add(
+        f"{hdr}{quote_ln}"
+        f"{indent}{label}：{name_str}\n"
+        f"{indent}时间：{pub_time}\n"
+        f"{indent}内容：{content}\n"
+        f"{indent}点赞数：{likes}\n"
+        f"{ip_ln}"
+    )
 
     if emotes:
-        result += f"{indent}表情：\n"
-        for e in emotes:
-            result += f"{indent}  - {e.get('name', '')} ({e.get('url', '')})\n"
+        _emit_emotes(add, indent, emotes)
 
     if replies:
-        result += f"{indent}\n————回复列表————\n"
+        # 回复内部的缩进前缀在循环外拼好，避免每条回复重复拼接
+        sub  = indent + "  "
+        add(f"{indent}\n————回复列表————\n")
         for idx, reply in enumerate(replies, 1):
-            r_author    = reply.get("author", {}).get("blogNickName", "Unknown")
-            r_blog_name = reply.get("author", {}).get("blogName", "")
-            r_name_str  = f"{r_author}[{r_blog_name}]" if r_blog_name else r_author
-            r_quote     = reply.get("quote", "")
-            r_ip        = reply.get("ipLocation", "")
-            r_emotes    = reply.get("emotes", [])
-
-            if r_quote:
-                result += f"{indent}引用：{r_quote}\n"
-            result += f"{indent}回复{idx}：\n"
-            result += f"{indent}  作者：{r_name_str}\n"
-            result += f"{indent}  时间：{reply.get('publishTimeFormatted', '')}\n"
-            result += f"{indent}  内容：{reply.get('content', '').strip()}\n"
-            result += f"{indent}  点赞数：{reply.get('likeCount', 0)}\n"
-            if r_ip:
-                result += f"{indent}  IP属地：{r_ip}\n"
+            rg          = reply.get
+            r_name_str  = _display_name(rg("author"))
+            r_quote     = rg("quote", "")
+            r_ip        = rg("ipLocation", "")
+            r_emotes    = rg("emotes", _NO_ITEMS)
+
+            # 引用 → 回复序号 → 作者/时间/内容/点赞 → IP，一次格式化完成
+            r_quote_ln = f"{indent}引用：{r_quote}\n" if r_quote else ""
+            r_ip_ln    = f"{sub}IP属地：{r_ip}\n" if r_ip else ""
+            add(
+                f"{r_quote_ln}"
+                f"{indent}回复{idx}：\n"
+                f"{sub}作者：{r_name_str}\n"
+                f"{sub}时间：{rg('publishTimeFormatted', '')}\n"
+                f"{sub}内容：{(rg('content') or '').strip()}\n"
+                f"{sub}点赞数：{rg('likeCount', 0)}\n"
+                f"{r_ip_ln}"
+            )
             if r_emotes:
-                result += f"{indent}  表情：\n"
-                for e in r_emotes:
-                    result += f"{indent}    - {e.get('name', '')} ({e.get('url', '')})\n"
-        result += f"{indent}\n"
+                _emit_emotes(add, sub, r_emotes)
+        add(f"{indent}\n")
+
+    add(f"{indent}\n")
+
 
-    result += f"{indent}\n"
-    return result
+def _display_name(author: Optional[Dict[str, Any]]) -> str:
+    """评论/回复共用的作者显示名：昵称[LOFTER ID]，无 ID 时只显示昵称。"""
+    author    = author or _EMPTY
+    nick      = author.get("blogNickName", "Unknown")
+    blog_name = author.get("blogName", "")
+    return f"{nick}[{blog_name}]" if blog_name else nick
+
+
+def _emit_emotes(add, indent: str, emotes) -> None:
+    """评论/回复共用的表情列表输出；indent 为“表情：”一行的缩进。"""
+    add(f"{indent}表情：\n")
+    for e in emotes:
+        add(f"{indent}  - {e.get('name', '')} ({e.get('url', '')})\n")
 
 
 def format_comments_block(structured: Dict[str, Any]) -> str:
@@ -246,24 +303,25 @@ def format_comments_block(structured: Dict[str, Any]) -> str:
     if not isinstance(structured, dict):
         return ""
 
-    hot_list = structured.get("hot_list", [])
-    all_list = structured.get("all_list", [])
+    hot_list = structured.get("hot_list") or []
+    all_list = structured.get("all_list") or []
+    if not hot_list and not all_list:
+        return ""
 
-    # 最终去重
+    # 所有片段收集到同一个扁平列表，最后只 join 一次；循环内用局部名绑定
+    parts: List[str] = ["[热门评论]\n"]
+    emit = _emit_comment
+    for c in hot_list:
+        emit(parts, c)
+
+    # 全部评论：去重与输出合并为一次遍历
+    parts.append("\n[全部评论]\n")
     seen: set = set()
-    unique_all: List[Dict] = []
+    seen_add  = seen.add
     for c in all_list:
         cid = c.get("id")
         if cid not in seen:
-            unique_all.append(c)
-            seen.add(cid)
-
-    result = "[热门评论]\n"
-    for c in hot_list:
-        result += format_comment(c)
-
-    result += "\n[全部评论]\n"
-    for c in unique_all:
-        result += format_comment(c)
+            seen_add(cid)
+            emit(parts, c)
 
-    return result
+    return "".join(parts)
@@ -2,8 +2,12 @@
 src/logger.py
 统一日志模块，提供彩色终端输出和静态状态打印工具
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from typing import Optional
 
 
@@ -31,14 +35,70 @@ class _ColoredFormatter(logging.Formatter):
         logging.CRITICAL: _C.BOLD + _C.RED,
     }
 
+    # 级别标签与 logger 名标签都预先拼好，格式化时只查表
+    _LEVEL_TAGS = {
+        level: f"{color}[{logging.getLevelName(level)[:4]}]{_C.RESET}"
+        for level, color in _LEVEL_COLORS.items()
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._name_tags: dict = {}
+
     def format(self, record: logging.LogRecord) -> str:
-        color = self._LEVEL_COLORS.get(record.levelno, _C.RESET)
-        level_tag = f"{color}[{record.levelname[:4]}]{_C.RESET}"
-        name_tag  = f"{_C.CYAN}[{record.name}]{_C.RESET}"
-        message   = super().format(record)
-        # 去掉原始格式中的 levelname 前缀，只保留消息
-        msg_only  = record.getMessage()
-        return f"{level_tag} {name_tag} {msg_only}"
+        level_tag = self._LEVEL_TAGS.get(record.levelno)
+        if level_tag is None:
+            level_tag = f"{_C.RESET}[{record.levelname[:4]}]{_C.RESET}"
+        name_tag = self._name_tags.get(record.name)
+        if name_tag is None:
+            name_tag = self._name_tags[record.name] = f"{_C.CYAN}[{record.name}]{_C.RESET}"
+        # 只输出消息本身（不附加时间、级别名等默认格式）
+        return f"{level_tag} {name_tag} {record.getMessage()}"
+
+
+# 所有 logger 只把记录放入队列，由单个后台线程统一格式化并写终端，
+# 工作线程记日志时不再争用 stdout
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _StreamHandler(logging.StreamHandler):
+    """终端输出 handler；遇到 flush_logs 放入的哨兵记录时只通知等待方，不输出。"""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        done = getattr(record, "flush_event", None)
+        if done is not None:
+            self.flush()
+            done.set()
+            return False
+        return super().handle(record)
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            handler = _StreamHandler(sys.stdout)
+            handler.setFormatter(_ColoredFormatter())
+            _listener = logging.handlers.QueueListener(_log_queue, handler)
+            _listener.start()
+            atexit.register(_listener.stop)
+
+
+def flush_logs() -> None:
+    """
+    等待队列中已有的日志全部输出。
+    直接写 stdout（横幅、进度条、错误提示）之前调用，保证与日志的先后顺序不乱。
+    """
+    with _listener_lock:
+        # 监听线程未启动或已随进程退出停止时，队列中不会再有待输出的记录
+        if _listener is None or _listener._thread is None:
+            return
+        # 哨兵排在已有记录之后，后台线程处理到它时，之前的日志都已写出
+        done = threading.Event()
+        _log_queue.put(logging.makeLogRecord({"flush_event": done}))
+    done.wait()
 
 
 def get_logger(name: str, debug: bool = False) -> logging.Logger:
@@ -53,9 +113,8 @@ def get_logger(name: str, debug: bool = False) -> logging.Logger:
         return logger
 
     logger.setLevel(logging.DEBUG if debug else logging.INFO)
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(_ColoredFormatter())
-    logger.addHandler(handler)
+    _ensure_listener()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
     logger.propagate = False
     return logger
 
@@ -67,12 +126,13 @@ class StatusDisplay:
 
     @staticmethod
     def print_header(title: str, info: Optional[dict] = None) -> None:
-        print(f"\n{_C.BOLD}{_C.CYAN}{'=' * 60}{_C.RESET}")
-        print(f"{_C.BOLD}{_C.CYAN}  {title}{_C.RESET}")
+        rule  = f"{_C.BOLD}{_C.CYAN}{'=' * 60}{_C.RESET}"
+        lines = ["", rule, f"{_C.BOLD}{_C.CYAN}  {title}{_C.RESET}"]
         if info:
-            for k, v in info.items():
-                print(f"  {_C.WHITE}{k}:{_C.RESET} {v}")
-        print(f"{_C.BOLD}{_C.CYAN}{'=' * 60}{_C.RESET}\n")
+            lines.extend(f"  {_C.WHITE}{k}:{_C.RESET} {v}" for k, v in info.items())
+        lines += [rule, "", ""]
+        # 整个横幅拼好后一次写出
+        sys.stdout.write("\n".join(lines))
 
     @staticmethod
     def print_section(title: str) -> None:
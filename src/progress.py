@@ -2,12 +2,16 @@
 src/progress.py
 轻量级进度条工具，在终端实时刷新一行显示进度
 """
+import functools
 import sys
 import time
 from typing import Optional
 
+from src.logger import flush_logs
 
-def _format_time(seconds: float) -> str:
+
+def format_time(seconds: float) -> str:
+    """将秒数格式化为 12.3s / 4.5m / 1.2h 形式。"""
     if seconds < 60:
         return f"{seconds:.1f}s"
     if seconds < 3600:
@@ -15,19 +19,27 @@ def _format_time(seconds: float) -> str:
     return f"{seconds / 3600:.1f}h"
 
 
+# 两次重绘之间的最小间隔（秒）；更新过于频繁时跳过中间帧
+_REDRAW_INTERVAL = 0.05
+
+# 当前格的部分填充字符（按 1/8 递增）
+_PARTIALS = ("▏", "▎", "▍", "▌", "▋", "▊", "▉", "█")
+
+
 def _draw_bar(progress: float, width: int = 30) -> str:
     filled = int(progress * width)
-    bar_chars = [" ", "▏", "▎", "▍", "▌", "▋", "▊", "▉", "█"]
-    bar = ""
-    for i in range(width):
-        if i < filled:
-            bar += "█"
-        elif i == filled:
-            partial = min(int((progress * width - filled) * 8), 7)
-            bar += bar_chars[partial + 1]
-        else:
-            bar += "░"
-    return bar
+    if filled >= width:
+        return _bar(width, 0, width)
+    partial = min(int((progress * width - filled) * 8), 7)
+    return _bar(filled, partial, width)
+
+
+@functools.lru_cache(maxsize=None)
+def _bar(filled: int, partial: int, width: int) -> str:
+    """按 (整格数, 部分格档位, 宽度) 缓存进度条字符串；每种宽度最多 8×width+1 种。"""
+    if filled >= width:
+        return "█" * width
+    return "█" * filled + _PARTIALS[partial] + "░" * (width - filled - 1)
 
 
 class ProgressBar:
@@ -45,25 +57,35 @@ class ProgressBar:
         self.total      = max(total, 1)
         self.label      = label
         self.width      = width
+        # 每帧不变的行首部分只拼一次
+        self._prefix    = f"\r{label} [" if label else "\r["
         self._start_ts: Optional[float] = None
+        self._last_draw = 0.0
 
     def start(self) -> None:
-        self._start_ts = time.time()
+        # 进度条直接写 stdout，先让排队中的日志输出完
+        flush_logs()
+        self._start_ts = time.monotonic()
         self._render(0)
 
     def update(self, current: int) -> None:
+        # 最后一帧总是绘制，其余按 _REDRAW_INTERVAL 节流
+        if current < self.total and time.monotonic() - self._last_draw < _REDRAW_INTERVAL:
+            return
         self._render(current)
 
     def finish(self) -> None:
-        self._render(self.total)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        # 最后一帧与结尾换行合并为一次写出
+        flush_logs()
+        self._render(self.total, end="\n")
 
-    def _render(self, current: int) -> None:
+    def _render(self, current: int, end: str = "") -> None:
         if self._start_ts is None:
-            self._start_ts = time.time()
+            self._start_ts = time.monotonic()
 
-        elapsed  = time.time() - self._start_ts
+        now      = time.monotonic()
+        elapsed  = now - self._start_ts
+        self._last_draw = now
         progress = current / self.total
         bar      = _draw_bar(progress, self.width)
         pct      = progress * 100
@@ -71,14 +93,12 @@ class ProgressBar:
         # ETA
         if current > 0 and progress < 1.0:
             eta_sec = elapsed / progress * (1 - progress)
-            eta_str = f"ETA {_format_time(eta_sec)}"
+            eta_str = f"ETA {format_time(eta_sec)}"
         else:
-            eta_str = _format_time(elapsed)
+            eta_str = format_time(elapsed)
 
-        label_str = f"{self.label} " if self.label else ""
-        line = (
-            f"\r{label_str}[{bar}] {current}/{self.total} "
-            f"({pct:.1f}%) {eta_str}   "
+        sys.stdout.write(
+            f"{self._prefix}{bar}] {current}/{self.total} "
+            f"({pct:.1f}%) {eta_str}   {end}"
         )
-        sys.stdout.write(line)
         sys.stdout.flush()
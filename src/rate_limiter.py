@@ -0,0 +1,40 @@
+"""
+src/rate_limiter.py
+线程安全的令牌桶限速器 — 多个工作线程共享同一个请求速率上限，
+取代每个线程各自 time.sleep 的做法。
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    令牌桶限速器。
+    用法：
+        limiter = RateLimiter(rate=4)   # 全局每秒最多 4 次
+        limiter.acquire()               # 必要时阻塞到下一个可用时刻
+    rate <= 0 表示不限速。
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate    = rate
+        self.burst   = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._last   = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # 先预订令牌（允许为负），锁外等待，后来者自动顺延
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
@@ -3,19 +3,21 @@ src/services/blog_service.py
 博客/帖子服务 — 处理单个帖子的完整下载流程：
   获取详情 → 提取图片 → 下载图片 → 获取评论 → 保存 JSON / TXT
 """
-import json
+import concurrent.futures
 import os
 import re
+import threading
 import time
 from typing import Any, Dict, List, Optional
 
 import config
+from src import fastjson
 from src.core.api_client import LofterClient
 from src.formatter import (
     build_post_filename,
     extract_post_metadata,
-    format_post_as_text,
     make_safe_filename,
+    post_text_lines,
 )
 from src.logger import get_logger
 from src.models.post import DownloadResult
@@ -24,6 +26,24 @@ from src.storage.file_writer import FileWriter
 from src.storage.image_downloader import ImageDownloader
 from src.storage.path_manager import path_manager
 
+# ── 帖子页面 ID 提取（预编译正则） ─────────────────────────────
+_CONTROL_FRAME_RE = re.compile(
+    r'<iframe[^>]*id=["\']control_frame["\'][^>]*src=["\'][^"\']*'
+    r'lofter\.com/control\?blogId=(\d+)(?:&|&amp;)postId=([a-zA-Z0-9_]+)',
+    re.IGNORECASE,
+)
+_COMMENT_FRAME_RE = re.compile(
+    r'<iframe[^>]*id=["\']comment_frame["\'][^>]*src=["\'][^"\']*'
+    r'pid=([a-zA-Z0-9_]+)(?:&|&amp;)bid=(\d+)',
+    re.IGNORECASE,
+)
+# 定位 control_frame 出现位置（忽略大小写，无需复制整篇 HTML 做 lower()）
+_CONTROL_FRAME_ID_RE = re.compile(r"control_frame", re.IGNORECASE)
+# control_frame 标签起点之后参与匹配的字符数（足以覆盖 src 属性）
+_CONTROL_FRAME_WINDOW = 1024
+_JSON_BLOG_ID_RE = re.compile(r'"blogId"\s*:\s*(\d+)')
+_JSON_POST_ID_RE = re.compile(r'"postId"\s*:\s*"?([a-zA-Z0-9_]+)"?')
+
 
 class BlogService:
     """
@@ -37,6 +57,24 @@ class BlogService:
         self._imgdl    = ImageDownloader(client)
         self._comment  = CommentService(client, debug)
         self._log      = get_logger("BlogService", debug)
+        # 后台写盘线程：原始 JSON 的写入与图片下载 / 评论抓取并行，按需创建
+        self._io_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._io_pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """等待后台写盘完成并关闭写盘线程池（之后再下载会重新创建）。"""
+        with self._io_pool_lock:
+            pool, self._io_pool = self._io_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _get_io_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._io_pool_lock:
+            if self._io_pool is None:
+                self._io_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="blog-io"
+                )
+            return self._io_pool
 
     # ── 公开接口 ────────────────────────────────────────────────
 
@@ -60,91 +98,31 @@ class BlogService:
             download_images:   是否下载图片
             filename_prefix:   文件名前缀（合集模式用序号）
         """
-        post_id = (post_meta.get("postData", {})
-                            .get("postView", {})
-                            .get("id", "unknown"))
-        result  = DownloadResult(post_id=str(post_id), base_filename="")
+        post_id = self._meta_post_id(post_meta)
 
+        # 1. 获取帖子详情
+        time.sleep(config.POST_DETAIL_REQUEST_DELAY)
         try:
-            # 1. 获取帖子详情
-            time.sleep(config.POST_DETAIL_REQUEST_DELAY)
             detail = self._client.fetch_post_detail(post_meta)
-            if not self._is_valid_detail(detail):
-                self._log.error(f"无法获取帖子详情: {post_id}")
-                result.success = False
-                result.error   = "fetch_post_detail 返回空"
-                return result
-
-            # 2. 构造文件名
-            meta          = extract_post_metadata(detail)
-            base_filename = build_post_filename(
-                meta["title"], meta["author"],
-                author_id=meta["blog_name"],
-                prefix=filename_prefix,
-            )
-            result.base_filename = base_filename
-
-            # 3. 保存原始 JSON
-            json_dir  = path_manager.get_json_dir(mode, name, "blog")
-            json_path = os.path.join(json_dir, f"{base_filename}.json")
-            self._fw.write_json(detail, json_path)
-            result.json_file = json_path
-
-            # 4. 提取图片链接
-            photo_links = self._extract_photo_links(detail)
-
-            # 5. 下载图片
-            photo_paths: List[str] = []
-            if download_images and photo_links:
-                photo_dir   = path_manager.get_photo_dir(mode, name)
-                photo_paths = self._imgdl.download_all(
-                    photo_links, photo_dir, base_filename
-                )
-            result.photo_files = photo_paths
-
-            # 6. 获取评论（None = 未请求，"" = 请求了但无内容）
-            comments_text = None
-            if download_comments:
-                post    = detail["response"]["posts"][0]["post"]
-                bid     = str(post.get("blogInfo", {}).get("blogId", ""))
-                pid     = str(post.get("id", post_id))
-                if pid and bid:
-                    comments_text = self._comment.fetch_and_save(
-                        pid, bid, mode, name, base_filename
-                    )
-                    result.comments_file = os.path.join(
-                        path_manager.get_json_dir(mode, name, "comments"),
-                        f"{base_filename}_comments.txt",
-                    )
-
-            # 7. 生成并保存 .txt
-            text_content = format_post_as_text(detail, photo_links, comments_text)
-
-            # 在文本中将原始图片 URL 替换为本地相对路径超链接
-            output_dir = path_manager.get_output_dir(mode, name)
-            txt_path   = os.path.join(output_dir, f"{base_filename}.txt")
-            if photo_paths and photo_links:
-                photo_dir = path_manager.get_photo_dir(mode, name)
-                url_map   = self._imgdl.build_url_to_local_map(
-                    photo_links, photo_dir, base_filename,
-                    text_file_dir=output_dir,
-                )
-                for orig_url, local_link in url_map.items():
-                    text_content = text_content.replace(
-                        orig_url, f"{orig_url} {local_link}"
-                    )
-
-            self._fw.write_text(text_content, txt_path)
-            result.text_file = txt_path
-
-            self._log.info(f"帖子保存完成: {base_filename}")
-            return result
-
         except Exception as e:
             self._log.error(f"download_post 异常 post={post_id}: {e}")
-            result.success = False
-            result.error   = str(e)
-            return result
+            return DownloadResult(post_id=str(post_id), base_filename="",
+                                  success=False, error=str(e))
+        if not self._is_valid_detail(detail):
+            self._log.error(f"无法获取帖子详情: {post_id}")
+            return DownloadResult(post_id=str(post_id), base_filename="",
+                                  success=False, error="fetch_post_detail 返回空")
+
+        # 2. 后续保存流程与 blog 模式共用
+        return self._save_detail(
+            detail=detail,
+            post_meta=post_meta,
+            mode=mode,
+            name=name,
+            download_comments=download_comments,
+            download_images=download_images,
+            filename_prefix=filename_prefix,
+        )
 
     def download_post_by_id(
         self,
@@ -199,6 +177,33 @@ class BlogService:
             filename_prefix="",
         )
 
+    def download_posts_by_id(
+        self,
+        post_ids:          List[str],
+        blog_id:           Optional[str],
+        download_comments: bool = True,
+        download_images:   bool = True,
+        post_workers:      int  = 1,
+    ) -> List[DownloadResult]:
+        """
+        批量调用 download_post_by_id；post_workers > 1 时多个帖子并发处理。
+        返回结果顺序与 post_ids 一致。
+        """
+        def _one(pid: str) -> DownloadResult:
+            return self.download_post_by_id(
+                post_id=pid,
+                blog_id=blog_id,
+                download_comments=download_comments,
+                download_images=download_images,
+            )
+
+        if post_workers <= 1 or len(post_ids) <= 1:
+            return [_one(pid) for pid in post_ids]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(post_workers, len(post_ids))
+        ) as ex:
+            return list(ex.map(_one, post_ids))
+
     # ── 内部方法 ────────────────────────────────────────────────
 
     def _save_detail(
@@ -211,13 +216,15 @@ class BlogService:
         download_images:   bool,
         filename_prefix:   str,
     ) -> DownloadResult:
-        """将已获取的 detail 保存到磁盘（避免重复请求）。"""
-        post_id = (post_meta.get("postData", {})
-                            .get("postView", {})
-                            .get("id", "unknown"))
+        """
+        将已获取的 detail 保存到磁盘（避免重复请求）：
+          构造文件名 → 保存 JSON → 下载图片 → 获取评论 → 保存 TXT
+        """
+        post_id = self._meta_post_id(post_meta)
         result  = DownloadResult(post_id=str(post_id), base_filename="")
 
         try:
+            post          = detail["response"]["posts"][0]["post"]
             meta          = extract_post_metadata(detail)
             base_filename = build_post_filename(
                 meta["title"], meta["author"],
@@ -226,45 +233,57 @@ class BlogService:
             )
             result.base_filename = base_filename
 
-            json_dir  = path_manager.get_json_dir(mode, name, "blog")
-            json_path = os.path.join(json_dir, f"{base_filename}.json")
-            self._fw.write_json(detail, json_path)
-            result.json_file = json_path
-
-            photo_links  = self._extract_photo_links(detail)
-            photo_paths: List[str] = []
-            if download_images and photo_links:
-                photo_dir   = path_manager.get_photo_dir(mode, name)
-                photo_paths = self._imgdl.download_all(
-                    photo_links, photo_dir, base_filename
-                )
-            result.photo_files = photo_paths
-
-            comments_text = None   # None = 未请求，"" = 请求了但无内容
-            if download_comments:
-                post = detail["response"]["posts"][0]["post"]
-                bid  = str(post.get("blogInfo", {}).get("blogId", ""))
-                pid  = str(post.get("id", post_id))
-                if pid and bid:
-                    comments_text = self._comment.fetch_and_save(
-                        pid, bid, mode, name, base_filename
+            # 保存原始 JSON（后台写入，不阻塞后续网络请求）
+            json_dir    = path_manager.get_json_dir(mode, name, "blog")
+            json_path   = os.path.join(json_dir, f"{base_filename}.json")
+            json_future = self._get_io_pool().submit(self._fw.write_json, detail, json_path)
+            try:
+                # 提取并下载图片
+                photo_links  = self._extract_photo_links(post)
+                photo_paths: List[str] = []
+                if download_images and photo_links:
+                    # 取目录会顺带创建，不下载图片时不建空的图片目录
+                    photo_dir   = path_manager.get_photo_dir(mode, name)
+                    photo_paths = self._imgdl.download_all(
+                        photo_links, photo_dir, base_filename
                     )
+                result.photo_files = photo_paths
+
+                # 获取评论（None = 未请求，"" = 请求了但无内容）
+                comments_text = None
+                if download_comments:
+                    bid = str(post.get("blogInfo", {}).get("blogId", ""))
+                    pid = str(post.get("id", post_id))
+                    if pid and bid:
+                        comments_text = self._comment.fetch_and_save(
+                            pid, bid, mode, name, base_filename
+                        )
+                        result.comments_file = self._comment.paths(
+                            pid, bid, mode, name, base_filename
+                        )[1]
+
+                # 生成 .txt，并将原始图片 URL 替换为本地相对路径超链接
+                text_lines = post_text_lines(detail, photo_links, comments_text, meta=meta)
+                output_dir = path_manager.get_output_dir(mode, name)
+                txt_path   = os.path.join(output_dir, f"{base_filename}.txt")
+
+                if photo_paths and photo_links:
+                    url_map = self._imgdl.build_url_to_local_map(
+                        photo_links, photo_dir, base_filename,
+                        text_file_dir=output_dir,
+                    )
+                    # URL 不含换行，逐行替换与整篇替换结果相同
+                    for orig, local in url_map.items():
+                        repl       = f"{orig} {local}"
+                        text_lines = [ln.replace(orig, repl) for ln in text_lines]
 
-            text_content = format_post_as_text(detail, photo_links, comments_text)
-            output_dir   = path_manager.get_output_dir(mode, name)
-            txt_path     = os.path.join(output_dir, f"{base_filename}.txt")
-
-            if photo_paths and photo_links:
-                photo_dir = path_manager.get_photo_dir(mode, name)
-                url_map   = self._imgdl.build_url_to_local_map(
-                    photo_links, photo_dir, base_filename,
-                    text_file_dir=output_dir,
-                )
-                for orig, local in url_map.items():
-                    text_content = text_content.replace(orig, f"{orig} {local}")
+                self._fw.write_lines(text_lines, txt_path)
+                result.text_file = txt_path
+            finally:
+                # 无论后续步骤是否出错都等待 JSON 写完，失败时 write_json 返回 ""
+                result.json_file = json_future.result()
 
-            self._fw.write_text(text_content, txt_path)
-            result.text_file = txt_path
+            self._log.info(f"帖子保存完成: {base_filename}")
             return result
 
         except Exception as e:
@@ -273,6 +292,11 @@ class BlogService:
             result.error   = str(e)
             return result
 
+    @staticmethod
+    def _meta_post_id(post_meta: dict) -> str:
+        post_view = (post_meta.get("postData") or {}).get("postView") or {}
+        return post_view.get("id", "unknown")
+
     @staticmethod
     def _is_valid_detail(detail: Optional[dict]) -> bool:
         return (detail is not None
@@ -280,12 +304,12 @@ class BlogService:
                 and detail["response"].get("posts"))
 
     @staticmethod
-    def _extract_photo_links(detail: dict) -> List[str]:
-        """从帖子详情中提取所有图片 URL（含付费彩蛋图片）。"""
+    def _extract_photo_links(post: dict) -> List[str]:
+        """从帖子（response.posts[0].post）中提取所有图片 URL（含付费彩蛋图片）。"""
         try:
-            post = detail["response"]["posts"][0]["post"]
-            raw  = post.get("photoLinks", "[]")
-            photos = json.loads(raw)
+            raw    = post.get("photoLinks", "[]")
+            # 通常是 JSON 字符串；若上游已解析成列表则直接使用
+            photos = fastjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
             links = [p.get("raw") or p.get("orign") for p in photos
                      if isinstance(p, dict)]
 
@@ -299,6 +323,21 @@ class BlogService:
         except Exception:
             return []
 
+    @staticmethod
+    def _search_control_frame(html_content: str) -> Optional[re.Match]:
+        """
+        先定位第一个 control_frame，只在其所在标签附近的小窗口内匹配正则；
+        窗口内未命中时，从该标签起点向后做一次完整搜索。
+        """
+        hit = _CONTROL_FRAME_ID_RE.search(html_content)
+        if hit is None:
+            return None
+        idx   = hit.start()
+        # 匹配必须包含 id 中的 control_frame，因此不会早于其所在标签的起点
+        start = max(html_content.rfind("<", 0, idx), 0)
+        m = _CONTROL_FRAME_RE.search(html_content, start, idx + _CONTROL_FRAME_WINDOW)
+        return m or _CONTROL_FRAME_RE.search(html_content, start)
+
     def _extract_ids_from_url(self, url: str):
         """
         从帖子页面 HTML 中提取 post_id / blog_id。
@@ -314,30 +353,20 @@ class BlogService:
             return None, None
 
         # 1) control_frame: ...control?blogId=123&postId=30b9c9c3
-        m = re.search(
-            r'<iframe[^>]*id=["\']control_frame["\'][^>]*src=["\'][^"\']*'
-            r'lofter\.com/control\?blogId=(\d+)(?:&|&amp;)postId=([a-zA-Z0-9_]+)',
-            html_content,
-            flags=re.IGNORECASE,
-        )
+        m = self._search_control_frame(html_content)
         if m:
             blog_id, post_id = m.group(1), m.group(2)
             return post_id, blog_id
 
         # 2) comment_frame: ...pid=30b9c9c3&bid=123
-        m = re.search(
-            r'<iframe[^>]*id=["\']comment_frame["\'][^>]*src=["\'][^"\']*'
-            r'pid=([a-zA-Z0-9_]+)(?:&|&amp;)bid=(\d+)',
-            html_content,
-            flags=re.IGNORECASE,
-        )
+        m = _COMMENT_FRAME_RE.search(html_content)
         if m:
             post_id, blog_id = m.group(1), m.group(2)
             return post_id, blog_id
 
         # 3) 内嵌 JSON: "blogId":123 / "postId":"30b9c9c3"
-        m_blog = re.search(r'"blogId"\s*:\s*(\d+)', html_content)
-        m_post = re.search(r'"postId"\s*:\s*"?([a-zA-Z0-9_]+)"?', html_content)
+        m_blog = _JSON_BLOG_ID_RE.search(html_content)
+        m_post = _JSON_POST_ID_RE.search(html_content)
         if m_blog:
             blog_id = m_blog.group(1)
         if m_post:
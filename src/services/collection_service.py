@@ -4,22 +4,25 @@ src/services/collection_service.py
 支持多线程（通过 post_workers 参数控制）。
 """
 import concurrent.futures
-import re
+import os
 import time
 from typing import Any, Dict, List
 
 import config
 from src.core.api_client import LofterClient
+from src.formatter import make_safe_filename
 from src.logger import get_logger
 from src.progress import ProgressBar
+from src.rate_limiter import RateLimiter
 from src.services.blog_service import BlogService
-
+from src.storage.file_writer import FileWriter
 
 class CollectionService:
 
     def __init__(self, client: LofterClient, debug: bool = False) -> None:
         self._client = client
         self._blog   = BlogService(client, debug)
+        self._fw     = FileWriter()
         self._log    = get_logger("CollectionService", debug)
 
     def process(
@@ -49,8 +52,19 @@ class CollectionService:
             return {"success": True, "collection_name": collection_name,
                     "total_posts": 0, "processed_posts": 0}
 
-        # 分页获取所有帖子条目
-        all_items = self._fetch_all_items(collection_id, post_count)
+        # 分页获取所有帖子条目（已缓存的部分直接复用，只补抓新增的偏移）
+        cached = self._load_cache(collection_id).get("items", [])
+        if len(cached) > post_count:
+            cached = []
+        if len(cached) == post_count:
+            self._log.info(f"使用本地缓存的帖子列表（{post_count} 篇）")
+            all_items = cached
+        else:
+            all_items = cached + self._fetch_all_items(
+                collection_id, post_count, start=len(cached)
+            )
+            if len(all_items) == post_count:
+                self._save_cache(collection_id, all_items)
         if not all_items:
             return {"success": False, "error": "合集帖子列表为空"}
 
@@ -90,6 +104,9 @@ class CollectionService:
                     pb.update(done)
 
         pb.finish()
+        # 所有帖子共用的评论线程池与写盘线程池在合集结束后统一关闭
+        self._client.shutdown_comment_pool()
+        self._blog.close()
         self._log.info(
             f"合集 '{collection_name}' 完成: {ok_count}/{len(all_items)} 成功"
         )
@@ -117,29 +134,58 @@ class CollectionService:
             "blog_id":    info.get("blogId", ""),
         }
 
-    def _fetch_all_items(self, collection_id: str, post_count: int) -> List[dict]:
-        limit     = 50
-        all_items: List[dict] = []
+    def _fetch_all_items(self, collection_id: str, post_count: int,
+                         start: int = 0) -> List[dict]:
+        """
+        并发获取合集帖子列表。各页偏移量事先已知，由少量线程同时请求，
+        请求节奏由共享限速器控制（每 COLLECTION_REQUEST_DELAY 秒一次）。
+        """
+        limit   = 50
+        delay   = config.COLLECTION_REQUEST_DELAY
+        limiter = RateLimiter(1 / delay if delay > 0 else 0)
 
-        for offset in range(0, post_count, limit):
+        def _fetch_page(offset: int) -> List[dict]:
+            limiter.acquire()
             self._log.info(f"  获取帖子 {offset+1}–{min(offset+limit, post_count)}…")
             resp = self._client.get_collection_list(
                 collection_id, offset=offset, limit=limit
             )
-            if resp and "items" in resp:
-                all_items.extend(resp["items"])
-            time.sleep(config.COLLECTION_REQUEST_DELAY)
+            return resp["items"] if resp and "items" in resp else []
+
+        all_items: List[dict] = []
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.COLLECTION_PAGE_WORKERS
+        ) as ex:
+            for items in ex.map(_fetch_page, range(start, post_count, limit)):
+                all_items.extend(items)
 
         return all_items
 
+    @staticmethod
+    def _cache_path(collection_id: str) -> str:
+        return os.path.join(config.CACHE_DIR, f"collection_{collection_id}.json")
+
+    def _load_cache(self, collection_id: str) -> Dict[str, Any]:
+        """读取合集帖子列表缓存；不存在或超过 COLLECTION_CACHE_TTL 时返回空字典。"""
+        data = self._fw.read_json(self._cache_path(collection_id))
+        if not isinstance(data, dict):
+            return {}
+        if time.time() - data.get("saved_at", 0) > config.COLLECTION_CACHE_TTL:
+            return {}
+        return data
+
+    def _save_cache(self, collection_id: str, items: List[dict]) -> None:
+        self._fw.write_json(
+            {"collection_id": collection_id, "saved_at": time.time(), "items": items},
+            self._cache_path(collection_id),
+        )
+
     def _download_item(self, item: dict, index: int, collection_name: str,
                        download_comments: bool, download_images: bool):
         """将合集 item 结构适配为 BlogService 所需的 post_meta 并下载。"""
         try:
-            post_data  = item.get("post", {})
-            blog_info  = item.get("blogInfo", {})
-            if "blogInfo" in post_data:
-                blog_info = post_data["blogInfo"]
+            post_data  = item.get("post") or {}
+            blog_info  = post_data.get("blogInfo") or item.get("blogInfo", {})
 
             post_meta = {
                 "blogInfo":  blog_info,
@@ -159,6 +205,7 @@ class CollectionService:
 
     @staticmethod
     def _safe_name(name: str) -> str:
-        safe = re.sub(r'[\\/*?:"<>|]', "_", name)
-        safe = safe.encode("utf-8", "ignore").decode("utf-8")
+        safe = make_safe_filename(name, max_len=None)
+        if not safe.isascii():
+            safe = safe.encode("utf-8", "ignore").decode("utf-8")
         return safe.strip() or "Unknown_Collection"
@@ -3,7 +3,7 @@ src/services/comment_service.py
 评论服务 — 获取、格式化、保存某个帖子的所有评论。
 """
 import os
-from typing import Optional
+from typing import Optional, Tuple
 
 from src.core.api_client import LofterClient
 from src.formatter import format_comments_block
@@ -43,16 +43,16 @@ class CommentService:
                                   not structured.get("all_list")):
                 return ""
 
+            json_path, txt_path = self.paths(post_id, blog_id, mode, name,
+                                             base_filename)
+
             # 保存原始结构化 JSON
-            json_dir  = path_manager.get_json_dir(mode, name, "comments")
-            json_path = os.path.join(json_dir, f"comments_{post_id}_{blog_id}.json")
             self._fw.write_json(structured, json_path)
 
             # 格式化评论文本
             comments_text = format_comments_block(structured)
 
             # 保存格式化 TXT
-            txt_path = os.path.join(json_dir, f"{base_filename}_comments.txt")
             self._fw.write_text(comments_text, txt_path)
 
             return comments_text
@@ -61,19 +61,12 @@ class CommentService:
             self._log.error(f"fetch_and_save 评论失败 post={post_id}: {e}")
             return ""
 
-    def fetch_text_only(
-        self,
-        post_id: str,
-        blog_id: str,
-    ) -> str:
-        """
-        仅获取并格式化评论文本，不写入文件（用于 comment 模式）。
-        """
-        try:
-            structured    = self._client.fetch_all_comments(post_id, blog_id)
-            if not structured:
-                return ""
-            return format_comments_block(structured)
-        except Exception as e:
-            self._log.error(f"fetch_text_only 评论失败 post={post_id}: {e}")
-            return ""
+    @staticmethod
+    def paths(post_id: str, blog_id: str, mode: str, name: str,
+              base_filename: str) -> Tuple[str, str]:
+        """返回 (评论 JSON 路径, 格式化评论 TXT 路径)，两者共用同一次目录解析。"""
+        comments_dir = path_manager.get_json_dir(mode, name, "comments")
+        return (
+            os.path.join(comments_dir, f"comments_{post_id}_{blog_id}.json"),
+            os.path.join(comments_dir, f"{base_filename}_comments.txt"),
+        )
@@ -3,7 +3,7 @@ src/services/subscription_service.py
 订阅服务 — 获取并保存用户订阅的合集列表。
 """
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from src.core.api_client import LofterClient
 from src.logger import get_logger
@@ -23,6 +23,7 @@ class SubscriptionService:
         获取所有订阅合集，保存为：
           - output/subscription.txt  （人类可读格式）
           - json/subscription.json   （原始 JSON）
+          - json/subscription.jsonl  （每行一个合集，便于流式读取）
         """
         self._log.info("开始获取订阅列表…")
 
@@ -33,15 +34,15 @@ class SubscriptionService:
         total = len(collections)
         self._log.info(f"共 {total} 个订阅合集")
 
-        # ── 保存 JSON ─────────────────────────────────────────
+        # ── 保存 JSON（目录由 FileWriter 按需创建并记忆）───────────
         json_path = os.path.join("json", "subscription.json")
-        os.makedirs("json", exist_ok=True)
         self._fw.write_json(collections, json_path)
+        jsonl_path = os.path.join("json", "subscription.jsonl")
+        self._fw.write_jsonl(collections, jsonl_path)
 
         # ── 保存人类可读 TXT ──────────────────────────────────
         txt_path = os.path.join("output", "subscription.txt")
-        os.makedirs("output", exist_ok=True)
-        txt_content = self._format_txt(collections, total)
+        txt_content, total_unread = self._format_txt(collections, total)
         self._fw.write_text(txt_content, txt_path)
 
         self._log.info(f"订阅列表已保存: {txt_path} / {json_path}")
@@ -49,24 +50,31 @@ class SubscriptionService:
         return {
             "success":            True,
             "total_subscriptions": total,
-            "total_unread":        sum(c.get("unreadCount", 0) for c in collections),
+            "total_unread":        total_unread,
             "txt_file":           txt_path,
             "json_file":          json_path,
+            "jsonl_file":         jsonl_path,
         }
 
     @staticmethod
-    def _format_txt(collections: List[dict], total: int) -> str:
-        lines = [f"订阅总数: {total}", "=" * 50]
+    def _format_txt(collections: List[dict], total: int) -> Tuple[str, int]:
+        """生成订阅列表文本，顺带统计未读总数（只遍历一次）。返回 (文本, 未读数)。"""
+        lines  = [f"订阅总数: {total}", "=" * 50]
+        add    = lines.append
+        sep    = "-" * 30
+        unread = 0
         for c in collections:
-            if not c.get("valid", True):
+            g = c.get
+            unread += g("unreadCount", 0)
+            if not g("valid", True):
                 continue
-            lines.append(f"合集名：{c.get('name', '')}")
-            lines.append(f"合集ID：{c.get('collectionId', '')}")
-            author = c.get("blogInfo", {}).get("blogNickName", "")
+            add(f"合集名：{g('name', '')}")
+            add(f"合集ID：{g('collectionId', '')}")
+            author = (g("blogInfo") or {}).get("blogNickName", "")
             if author:
-                lines.append(f"作者：{author}")
-            url = c.get("collectionUrl", "")
+                add(f"作者：{author}")
+            url = g("collectionUrl", "")
             if url:
-                lines.append(f"链接：{url}")
-            lines.append("-" * 30)
-        return "\n".join(lines)
+                add(f"链接：{url}")
+            add(sep)
+        return "\n".join(lines), unread
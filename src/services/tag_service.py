@@ -5,13 +5,13 @@ src/services/tag_service.py
 """
 import concurrent.futures
 import os
-import time
 from typing import Any, Dict, List
 
 import config
 from src.core.api_client import LofterClient
 from src.logger import get_logger
 from src.progress import ProgressBar
+from src.rate_limiter import RateLimiter
 from src.services.blog_service import BlogService
 from src.storage.file_writer import FileWriter
 from src.storage.path_manager import path_manager
@@ -56,6 +56,10 @@ class TagService:
             total_ok  += res.get("processed", 0)
             total_err += res.get("failed",    0)
 
+        # 所有帖子共用的评论线程池与写盘线程池在全部标签结束后统一关闭
+        self._client.shutdown_comment_pool()
+        self._blog.close()
+
         return {
             "success":             True,
             "total_tags":          len([t for t in tags if t]),
@@ -96,15 +100,19 @@ class TagService:
         pb = ProgressBar(total=len(posts), label=f"[{tag}]")
         pb.start()
 
+        # 帖子之间的间隔由共享限速器控制：下载本身已超过间隔时不再额外等待
+        delay   = config.TAG_POST_REQUEST_DELAY
+        limiter = RateLimiter(1 / delay if delay > 0 else 0)
+
         if post_workers <= 1:
             # 单线程
             for i, post_meta in enumerate(posts):
-                r = self._download_one(post_meta, tag, download_comments, download_images)
+                r = self._download_one(post_meta, tag, download_comments,
+                                       download_images, limiter)
                 if r.success:
                     ok_count += 1
                 else:
                     err_count += 1
-                time.sleep(config.TAG_POST_REQUEST_DELAY)
                 pb.update(i + 1)
         else:
             # 多线程
@@ -112,7 +120,7 @@ class TagService:
                 futures = {
                     ex.submit(
                         self._download_one,
-                        pm, tag, download_comments, download_images
+                        pm, tag, download_comments, download_images, limiter
                     ): idx
                     for idx, pm in enumerate(posts)
                 }
@@ -137,7 +145,10 @@ class TagService:
             "failed":    err_count,
         }
 
-    def _download_one(self, post_meta, tag, download_comments, download_images):
+    def _download_one(self, post_meta, tag, download_comments, download_images,
+                      limiter: RateLimiter = None):
+        if limiter is not None:
+            limiter.acquire()
         return self._blog.download_post(
             post_meta=post_meta,
             mode="tag",
@@ -153,7 +164,6 @@ class TagService:
             if not pages:
                 return
             json_dir  = os.path.join(path_manager.base_json, "tag", tag)
-            os.makedirs(json_dir, exist_ok=True)
             filepath  = os.path.join(json_dir, "tagresponse.json")
             self._fw.write_json(pages, filepath)
         except Exception as e:
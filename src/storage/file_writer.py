@@ -2,49 +2,128 @@
 src/storage/file_writer.py
 统一文件写入层 — 所有磁盘 I/O 操作集中在此，其他模块不直接写文件。
 """
-import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, Set
+
+import config
+from src import fastjson
+from src.logger import get_logger
+
+# 分块写出（write_lines / 标准库 JSON）时的缓冲区大小，小片段合并后再落盘
+_WRITE_BUFFER = 1 << 20
+
+# 本进程内已确认存在的目录；同一目录下批量写文件时只 makedirs 一次
+_DIRS_CREATED: Set[str] = set()
+
+# 写入失败与其他日志走同一队列输出，保持先后顺序
+_log = get_logger("FileWriter")
+
+
+def ensure_dir(path: str) -> None:
+    """确保目录存在（按路径记忆，重复调用不再触发系统调用）。"""
+    if path and path not in _DIRS_CREATED:
+        os.makedirs(path, exist_ok=True)
+        _DIRS_CREATED.add(path)
 
 
 class FileWriter:
-    """提供 JSON / 文本 两种写入方式，自动创建缺失的目录。"""
+    """提供 JSON / JSONL / 文本写入方式，自动创建缺失的目录。"""
 
     @staticmethod
     def write_json(data: Any, filepath: str) -> str:
         """
         将任意可 JSON 序列化的对象保存为 UTF-8 编码的 .json 文件。
+        是否缩进由 config.JSON_PRETTY 控制。
         返回写入路径；失败时返回空字符串。
         """
         try:
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            ensure_dir(os.path.dirname(filepath))
+            with open(filepath, "wb", buffering=_WRITE_BUFFER) as f:
+                fastjson.dump(data, f, pretty=config.JSON_PRETTY)
             return filepath
         except Exception as e:
-            print(f"[FileWriter] 写入 JSON 失败 {filepath}: {e}")
+            _log.error("写入 JSON 失败 %s: %s", filepath, e)
             return ""
 
     @staticmethod
     def write_text(content: str, filepath: str) -> str:
         """
-        将字符串保存为 UTF-8 编码的文本文件。
+        将字符串保存为 UTF-8 编码的文本文件（换行符按平台转换，与文本模式一致）。
+        整段内容只编码一次，直接以 os.write 写入，不经过 TextIOWrapper。
+        返回写入路径；失败时返回空字符串。
+        """
+        try:
+            ensure_dir(os.path.dirname(filepath))
+            if os.linesep != "\n":
+                content = content.replace("\n", os.linesep)
+            _write_bytes(filepath, content.encode("utf-8"))
+            return filepath
+        except Exception as e:
+            _log.error("写入文本失败 %s: %s", filepath, e)
+            return ""
+
+    @staticmethod
+    def write_lines(lines: Iterable[str], filepath: str) -> str:
+        """
+        将若干行（不含换行符）以换行分隔写入 UTF-8 文本文件。
+        逐行交给缓冲写入，不在内存中拼出整篇文本。
+        返回写入路径；失败时返回空字符串。
+        """
+        try:
+            ensure_dir(os.path.dirname(filepath))
+            with open(filepath, "w", encoding="utf-8",
+                      buffering=_WRITE_BUFFER) as f:
+                f.writelines(_with_newlines(lines))
+            return filepath
+        except Exception as e:
+            _log.error("写入文本失败 %s: %s", filepath, e)
+            return ""
+
+    @staticmethod
+    def write_jsonl(items: Iterable[Any], filepath: str) -> str:
+        """
+        将若干对象保存为 JSON Lines：每行一个紧凑 JSON，以换行结尾。
+        下游工具可逐行读取，无需一次性解析整个数组。
         返回写入路径；失败时返回空字符串。
         """
         try:
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
+            ensure_dir(os.path.dirname(filepath))
+            with open(filepath, "wb", buffering=_WRITE_BUFFER) as f:
+                for item in items:
+                    f.write(fastjson.dumps(item))
+                    f.write(b"\n")
             return filepath
         except Exception as e:
-            print(f"[FileWriter] 写入文本失败 {filepath}: {e}")
+            _log.error("写入 JSONL 失败 %s: %s", filepath, e)
             return ""
 
     @staticmethod
     def read_json(filepath: str) -> Any:
         """读取 JSON 文件，失败时返回 None。"""
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(filepath, "rb") as f:
+                return fastjson.loads(f.read())
         except Exception:
             return None
+
+
+def _write_bytes(filepath: str, data: bytes) -> None:
+    """以 O_TRUNC 打开文件并用 os.write 写入全部数据（处理部分写入）。"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd    = os.open(filepath, flags, 0o666)   # 与 open() 相同，实际权限受 umask 约束
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _with_newlines(lines: Iterable[str]) -> Iterator[str]:
+    """在相邻两行之间插入换行符（末行之后不加），与 "\\n".join 结果一致。"""
+    first = True
+    for line in lines:
+        if not first:
+            yield "\n"
+        first = False
+        yield line
@@ -8,6 +8,7 @@ from typing import List, Optional
 from urllib.parse import urlparse
 
 import config
+from src.storage.file_writer import ensure_dir
 
 
 class ImageDownloader:
@@ -31,7 +32,7 @@ class ImageDownloader:
         if not urls:
             return []
 
-        os.makedirs(save_dir, exist_ok=True)
+        ensure_dir(save_dir)
 
         tasks: List[tuple] = []  # (url, filepath)
         for i, url in enumerate(urls):
@@ -73,11 +74,19 @@ class ImageDownloader:
         用于在 .txt 文件中将原始 URL 替换为本地超链接。
         """
         url_map: dict = {}
+        # 一次 scandir 读出目录内已有文件名，代替逐个 os.path.exists
+        try:
+            with os.scandir(save_dir) as it:
+                present = {e.name for e in it}
+        except OSError:
+            return url_map
+
+        # 所有图片在同一目录下，相对路径的目录部分只需计算一次
+        rel_dir = os.path.relpath(save_dir, start=text_file_dir)
         for i, url in enumerate(urls):
             ext      = self._get_extension(url)
             filename = f"{base_filename} ({i + 1}){ext}"
-            filepath = os.path.join(save_dir, filename)
-            if os.path.exists(filepath):
-                rel = os.path.relpath(filepath, start=text_file_dir).replace("\\", "/")
-                url_map[url] = f"[{filename}]({rel})"
+            if filename in present:
+                rel = filename if rel_dir == os.curdir else os.path.join(rel_dir, filename)
+                url_map[url] = f"[{filename}]({rel.replace(os.sep, '/')})"
         return url_map
@@ -10,9 +10,10 @@ import os
 from typing import Optional
 
 import config
+from src.storage.file_writer import ensure_dir
 
 # 合法的 mode 值
-_VALID_MODES = {"tag", "blog", "collection", "comment", "subscription", "update"}
+_VALID_MODES = frozenset({"tag", "blog", "collection", "comment", "subscription", "update"})
 
 
 class PathManager:
@@ -29,7 +30,7 @@ class PathManager:
         """
         self._check_mode(mode)
         path = os.path.join(self.base_output, mode, name) if name else os.path.join(self.base_output, mode)
-        os.makedirs(path, exist_ok=True)
+        ensure_dir(path)
         return path
 
     # ── JSON 目录 ───────────────────────────────────────────────
@@ -63,7 +64,7 @@ class PathManager:
                 parts.append(sub_dir)
             path = os.path.join(*parts)
 
-        os.makedirs(path, exist_ok=True)
+        ensure_dir(path)
         return path
 
     # ── 图片目录 ───────────────────────────────────────────────
@@ -71,14 +72,14 @@ class PathManager:
         """photo/<mode>/<name>/"""
         self._check_mode(mode)
         path = os.path.join(self.base_photo, mode, name) if name else os.path.join(self.base_photo, mode)
-        os.makedirs(path, exist_ok=True)
+        ensure_dir(path)
         return path
 
     @staticmethod
     def _check_mode(mode: str) -> None:
         if mode not in _VALID_MODES:
             raise ValueError(
-                f"Invalid mode '{mode}'. Must be one of {_VALID_MODES}"
+                f"Invalid mode '{mode}'. Must be one of {sorted(_VALID_MODES)}"
             )
 
 